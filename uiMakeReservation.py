@@ -1,16 +1,19 @@
 # reservation_app.py
-import json, os, datetime as dt, re
+import json, os, datetime as dt, re, hmac, functools, itertools, calendar
 import tkinter as tk
 from tkinter import ttk, messagebox
 
 # --------- Constants ---------
 DATA_FILE, ROOM_COUNT = "hrs_data.json", 45
+DEFAULT_BASE_RATE = 300.0
 TODAY = dt.date.today
-ISO = dt.date.fromisoformat
+ISO = functools.lru_cache(maxsize=4096)(dt.date.fromisoformat)
 RATE_MULT = {"Prepaid": 0.75, "60-Day": 0.85, "Conventional": 1.00, "Incentive": 0.80}
-ROOM_TYPES = ["Standard", "Deluxe", "Suite", "Penthouse"]
-STATUSES = ["Booked", "In-House", "Checked-out", "Cancelled", "Changing date"]
-CARD_TYPES = ["Visa", "MasterCard", "AmEx", "Discover"]
+ROOM_TYPES = ("Standard", "Deluxe", "Suite", "Penthouse")
+STATUSES = ("Booked", "In-House", "Checked-out", "Cancelled", "Changing date")
+CARD_TYPES = ("Visa", "MasterCard", "AmEx", "Discover")
+EXP_RE = re.compile(r"^(0[1-9]|1[0-2])-(\d{4})$")
+LOCATOR_RE = re.compile(r"^OO(\d+)$")
 
 # --------- Persistence ---------
 def load_state():
@@ -24,9 +27,26 @@ def load_state():
             data["last_locator"] = 4000
         return data
 
-def save_state(state):
-    with open(DATA_FILE, "w") as f:
-        json.dump(state, f, indent=2)
+def save_state(state, path=DATA_FILE, pretty=False):
+    # "_" keys are in-memory caches
+    data = {k: v for k, v in state.items() if not k.startswith("_")}
+    data["reservations"] = [{k: v for k, v in r.items() if not k.startswith("_")} for r in state["reservations"]]
+    # atomic write via a temp file
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        if pretty:
+            json.dump(data, f, indent=2)
+        else:
+            json.dump(data, f, separators=(",", ":"))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+def file_mtime(path=DATA_FILE):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
 
 # --------- Pricing helpers ---------
 def daterange(start, end):
@@ -35,26 +55,52 @@ def daterange(start, end):
         start += dt.timedelta(days=1)
 
 def base_rate(state, d):
-    return float(state["base_rates"].get(d.isoformat(), 300.0))
+    return float(state["base_rates"].get(d.isoformat(), DEFAULT_BASE_RATE))
+
+def stay_span(r):
+    # (arrive, depart) as day ordinals, cached on the record
+    key = (r["arrive"], r["depart"])
+    span = r.get("_span")
+    if span is None or span[0] != key:
+        span = r["_span"] = (key, ISO(key[0]).toordinal(), ISO(key[1]).toordinal())
+    return span[1], span[2]
+
+def nightly_counts(spans, start, end):
+    # Rooms taken on each night of [start, end)
+    s, n = start.toordinal(), (end - start).days
+    if n <= 0: return []
+    delta = [0] * (n + 1)
+    for a, d in spans:
+        a, d = max(a - s, 0), min(d - s, n)
+        if a < d:
+            delta[a] += 1
+            delta[d] -= 1
+    return list(itertools.accumulate(delta[:n]))
 
 def occ_ratio(state, start, end, exclude_reservation_id=None):
     res = [r for r in state["reservations"] if r.get("status","Booked") in ("Booked","In-House")]
     if exclude_reservation_id:
         res = [r for r in res if r.get("reservation_id", r.get("locator")) != exclude_reservation_id]
     if not res: return 0.0
-    nightly_counts = [sum(ISO(r["arrive"]) <= d < ISO(r["depart"]) for r in res) for d in daterange(start, end)]
-    return (sum(nightly_counts)/len(nightly_counts))/ROOM_COUNT if nightly_counts else 0.0
+    s, e = start.toordinal(), end.toordinal()
+    if e <= s: return 0.0
+    # total stay-nights inside [start, end)
+    occupied = 0
+    for r in res:
+        a, d = stay_span(r)
+        a, d = max(a, s), min(d, e)
+        if a < d:
+            occupied += d - a
+    return (occupied/(e - s))/ROOM_COUNT
 
 def is_available_for(state, start, end, exclude_reservation_id=None):
-    counts = []
-    for d in daterange(start, end):
-        occupied = sum(ISO(r["arrive"]) <= d < ISO(r["depart"]) and r.get("status") in ("Booked","In-House")
-                       and r.get("reservation_id", r.get("locator")) != exclude_reservation_id
-                       for r in state["reservations"])
-        counts.append(occupied)
+    spans = [stay_span(r) for r in state["reservations"] if r.get("status") in ("Booked","In-House")
+             and r.get("reservation_id", r.get("locator")) != exclude_reservation_id]
+    counts = nightly_counts(spans, start, end)
     if not counts:
         return True, ROOM_COUNT
-    min_available = min(max(0, ROOM_COUNT - c) for c in counts)
+    # fewest free rooms falls on the busiest night
+    min_available = max(0, ROOM_COUNT - max(counts))
     return min_available > 0, min_available
 
 def quote_total(state, arrive, depart, rtype, original_cost=0.0, is_change=False):
@@ -72,7 +118,9 @@ def quote_total(state, arrive, depart, rtype, original_cost=0.0, is_change=False
     mult = RATE_MULT.get(rtype, 1.0)
     if rtype == "Incentive" and not eligible:
         mult = 1.0
-    nightly = {d.isoformat(): round(base_rate(state, d) * mult, 2) for d in daterange(start, end)}
+    # base_rate, inlined
+    rates = state["base_rates"]
+    nightly = {k: round(float(rates.get(k, DEFAULT_BASE_RATE)) * mult, 2) for k in map(dt.date.isoformat, daterange(start, end))}
     new_total = round(sum(nightly.values()), 2)
     change_note = ""
     penalty_amount = 0.0
@@ -91,51 +139,53 @@ def quote_total(state, arrive, depart, rtype, original_cost=0.0, is_change=False
 
     return total, nightly, eligible, occ, change_note, penalty_amount
 
+def first_night_rate(state, rec):
+    # Locked first-night rate, else the base rate for the arrival date
+    nightly = rec.get("snapshot", {}).get("nightly")
+    return next(iter(nightly.values())) if nightly else base_rate(state, ISO(rec["arrive"]))
+
 def next_locator(state):
+    # saved by the caller
     state["last_locator"] = int(state.get("last_locator", 4000)) + 1
-    save_state(state)
     return f"OO{state['last_locator']}"
 
 def run_daily_tasks(state):
     today = TODAY()
-    tasks_performed = []
+    t = today.toordinal()
+    reminders, cancellations, no_shows = [], [], []
 
-    # Payment reminders for 60-Day (45 days before arrival)
+    # Single pass over Booked reservations
     for res in state["reservations"]:
-        if res.get("status") == "Booked" and res.get("rtype") == "60-Day":
-            arrive_date = ISO(res["arrive"])
-            if (arrive_date - today).days == 45:
+        if res.get("status") != "Booked":
+            continue
+        days_out = ISO(res["arrive"]).toordinal() - t
+        if res.get("rtype") == "60-Day":
+            # Payment reminders for 60-Day (45 days before arrival)
+            if days_out == 45:
                 loc = res.get("reservation_id", res.get("locator", "Unknown"))
                 state["payment_reminders_sent"][loc] = today.isoformat()
-                tasks_performed.append(f"Payment reminder sent for reservation {loc}")
-
-    # Cancel 60-Day reservations with no paid_advance 30 days before arrival
-    for res in state["reservations"]:
-        if res.get("status") == "Booked" and res.get("rtype") == "60-Day":
-            arrive_date = ISO(res["arrive"])
-            if (arrive_date - today).days == 30 and float(res.get("paid_advance", 0.0)) == 0.0:
+                reminders.append(f"Payment reminder sent for reservation {loc}")
+            # Cancel 60-Day reservations with no paid_advance 30 days before arrival
+            elif days_out == 30 and float(res.get("paid_advance", 0.0)) == 0.0:
                 res["status"] = "Cancelled"
                 res["cancelled_date"] = today.isoformat()
-                tasks_performed.append(f"60-Day reservation {res.get('reservation_id', res.get('locator','Unknown'))} cancelled (no payment 30 days before arrival)")
-
-    # No-show penalties: yesterday arrivals not checked in
-    yesterday = today - dt.timedelta(days=1)
-    for res in state["reservations"]:
-        if res.get("status") == "Booked" and ISO(res["arrive"]) == yesterday and not res.get("checked_in", False):
-            first_night = list(res.get("snapshot", {}).get("nightly", {}).values())[0] if res.get("snapshot", {}).get("nightly") else base_rate(state, yesterday)
+                cancellations.append(f"60-Day reservation {res.get('reservation_id', res.get('locator','Unknown'))} cancelled (no payment 30 days before arrival)")
+        # No-show penalties: yesterday arrivals not checked in
+        if days_out == -1 and not res.get("checked_in", False):
+            first_night = first_night_rate(state, res)
             res["no_show_penalty"] = first_night
             res["status"] = "Cancelled"
             res["cancellation_reason"] = "No-show"
-            tasks_performed.append(f"No-show penalty applied to reservation {res.get('reservation_id', res.get('locator','Unknown'))}: ${first_night:.2f}")
+            no_shows.append(f"No-show penalty applied to reservation {res.get('reservation_id', res.get('locator','Unknown'))}: ${first_night:.2f}")
 
-    if tasks_performed:
-        save_state(state)
-    return tasks_performed
+    # caller saves
+    return reminders + cancellations + no_shows
 
 def mask_card(card_number: str) -> str:
     if not card_number or len(card_number) < 4:
         return "****"
-    digits = "".join(ch for ch in card_number if ch.isdigit())
+    # all-digit fast path
+    digits = card_number if card_number.isdigit() else "".join(ch for ch in card_number if ch.isdigit())
     if len(digits) < 4:
         return "****"
     return "*" * (len(digits) - 4) + digits[-4:]
@@ -147,22 +197,21 @@ def is_valid_phone(phone): return phone.isdigit() and 10 <= len(phone) <= 11
 def is_valid_address(addr): return bool(addr.strip())
 def is_valid_card(card): return card.isdigit() and 13 <= len(card) <= 16
 def is_valid_exp(exp_str):
-    m = re.match(r"^(0[1-9]|1[0-2])-(\d{4})$", exp_str.strip())
+    m = EXP_RE.match(exp_str.strip())
     if not m: return False
     mm, yyyy = int(m.group(1)), int(m.group(2))
     try:
-        next_month = dt.date(yyyy, mm, 28) + dt.timedelta(days=4)
-        last_day = dt.date(next_month.year, next_month.month, 1) - dt.timedelta(days=1)
+        last_day = dt.date(yyyy, mm, calendar.monthrange(yyyy, mm)[1])
         return last_day >= TODAY()
-    except: return False
+    except (ValueError, OverflowError): return False
 def is_valid_date(date_str):
     try: ISO(date_str); return True
-    except: return False
+    except (TypeError, ValueError): return False
 def is_valid_days(days_str):
     try:
         d = int(days_str)
         return 1 <= d <= 60
-    except:
+    except (TypeError, ValueError):
         return False
 
 # --------- Status code mapping ---------
@@ -178,6 +227,7 @@ class LoginWindow(tk.Tk):
         self.geometry("380x200")
         self.resizable(False, False)
         self.users = {"staff": "oasis2025", "manager": "orchid#9"}
+        self.authorized_user = None
         frame = ttk.Frame(self, padding=12); frame.pack(fill="both", expand=True)
         ttk.Label(frame, text="Username").grid(row=0, column=0, sticky="w", pady=(0,6))
         ttk.Label(frame, text="Password").grid(row=1, column=0, sticky="w")
@@ -189,11 +239,10 @@ class LoginWindow(tk.Tk):
 
     def _login(self):
         u, p = self.u.get().strip(), self.p.get().strip()
-        if u in self.users and self.users[u] == p:
+        expected = self.users.get(u)
+        if expected is not None and hmac.compare_digest(expected.encode(), p.encode()):
+            self.authorized_user = u
             self.destroy()
-            app = ReservationApp(authorized_user=u)
-            app.geometry("1100x820")
-            app.mainloop()
         else:
             self.msg.config(text="Invalid credentials. Access denied.")
 
@@ -206,9 +255,10 @@ class ReservationApp(tk.Tk):
         self.state_data = load_state()
 
         if not self.state_data["base_rates"]:
-            t = TODAY()
-            self.state_data["base_rates"] = {(t+dt.timedelta(days=i)).isoformat(): 280.0 + 10*(i % 5) for i in range(30)}
+            base = TODAY().toordinal()
+            self.state_data["base_rates"] = {dt.date.fromordinal(base+i).isoformat(): 280.0 + 10*(i % 5) for i in range(30)}
             save_state(self.state_data)
+        self._file_mtime = file_mtime()
 
         # Form variables
         self.guest = tk.StringVar(); self.email = tk.StringVar(); self.phone = tk.StringVar()
@@ -231,6 +281,11 @@ class ReservationApp(tk.Tk):
         self.up_pay_amt = tk.StringVar()
 
         self.last_quote = None; self.selected_reservation = None
+        self._save_job = None; self._search_job = None
+        self._tree_rows = {}  # iid -> values held by res_tree, attached or detached
+        self._quote_rows = {}  # night (ISO date, also the iid) -> values shown in the quote table
+        self._rebuild_index()
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
 
         # Layout root
         root = ttk.Frame(self, padding=10); root.pack(fill="both", expand=True)
@@ -352,13 +407,16 @@ class ReservationApp(tk.Tk):
         tb = ttk.Frame(right)
         tb.grid(row=0, column=0, columnspan=2, sticky="ew", pady=(4,2))
         ttk.Button(tb, text="Refresh", command=self.refresh_res_list).pack(side="left")
+        ttk.Button(tb, text="Reload", command=self.reload_from_disk).pack(side="left", padx=(4,0))
         ttk.Label(tb, text="Search Guest:").pack(side="left", padx=(8,4))
         self.search_var = tk.StringVar()
         ttk.Entry(tb, textvariable=self.search_var, width=18).pack(side="left")
+        self.search_var.trace_add("write", self._schedule_search)
         ttk.Button(tb, text="Find", command=self.refresh_res_list).pack(side="left", padx=4)
 
         ttk.Label(tb, text="Reservation ID:").pack(side="left", padx=(12,4))
         ttk.Entry(tb, textvariable=self.search_res_id, width=14).pack(side="left")
+        self.search_res_id.trace_add("write", self._schedule_search)
         ttk.Button(tb, text="Find ID", command=self.search_by_reservation_id).pack(side="left", padx=4)
 
         # Table
@@ -439,6 +497,50 @@ class ReservationApp(tk.Tk):
         self.refresh_res_list()
 
     # --------- Helpers ---------
+    def _rebuild_index(self):
+        # reservation id -> record; first match wins
+        self._res_index = {}
+        for r in self.state_data["reservations"]:
+            self._res_index.setdefault(str(r.get("reservation_id") or r.get("locator")), r)
+
+    def _schedule_save(self):
+        # Coalesce bursts of edits into a single write of the data file
+        if self._save_job:
+            self.after_cancel(self._save_job)
+        self._save_job = self.after(500, self._flush_state)
+
+    def _flush_state(self):
+        if self._save_job:
+            self.after_cancel(self._save_job)
+        self._save_job = None
+        if file_mtime() != self._file_mtime and not messagebox.askyesno(
+                "Data File Changed",
+                f"{DATA_FILE} was changed by another program since it was loaded.\n"
+                "Overwrite it with the changes made here?"):
+            self._load_from_disk()
+            return False
+        save_state(self.state_data)
+        self._file_mtime = file_mtime()
+        return True
+
+    def _check_disk(self):
+        # Pick up writes from other windows/programs; True if the data was reloaded
+        if file_mtime() == self._file_mtime:
+            return False
+        if self._save_job and not messagebox.askyesno(
+                "Data File Changed",
+                f"{DATA_FILE} was changed by another program.\n"
+                "Discard the unsaved changes made here and reload it?"):
+            self._file_mtime = file_mtime()
+            return False
+        self._load_from_disk()
+        return True
+
+    def _on_close(self):
+        if self._save_job:
+            self._flush_state()
+        self.destroy()
+
     def _toggle_manual_res_id(self):
         if self.auto_assign_res_id.get():
             self.ent_manual_res_id.config(state="disabled")
@@ -449,7 +551,7 @@ class ReservationApp(tk.Tk):
     def _calc_nights(self, arrive, depart):
         try:
             return (ISO(depart) - ISO(arrive)).days
-        except Exception:
+        except (TypeError, ValueError):
             return None
 
     def _apply_payment_update(self):
@@ -472,8 +574,8 @@ class ReservationApp(tk.Tk):
         rec["paid_advance_date"] = pay_date
         if rec["paid_advance"] >= rec.get("total_locked", 0.0):
             rec["fully_paid"] = True
-        save_state(self.state_data)
-        self.refresh_res_list()
+        self._schedule_save()
+        self._update_row(rec)
         messagebox.showinfo("Payment Update", f"Payment applied for {rec.get('reservation_id', rec.get('locator'))}.\nPaid advance now ${rec['paid_advance']:,.2f} on {pay_date}.")
 
     # --------- Actions: Quote & Save ---------
@@ -487,35 +589,46 @@ class ReservationApp(tk.Tk):
         if (not dep_str) and is_valid_days(days_str):
             arr_d = ISO(arr_str)
             dep_d = arr_d + dt.timedelta(days=int(days_str))
-            self.dep.set(dep_d.isoformat())
-            dep_str = self.dep.get()
+            dep_str = dep_d.isoformat()
+            self.dep.set(dep_str)
         if (not days_str) and is_valid_date(dep_str):
             try:
                 span = (ISO(dep_str) - ISO(arr_str)).days
                 if span <= 0:
                     return messagebox.showerror("Quote error", "Departure must be after arrival.")
-                self.days.set(str(span))
+                days_str = str(span)
+                self.days.set(days_str)
             except Exception:
                 return messagebox.showerror("Quote error", "Invalid departure date.")
-        if not is_valid_days(self.days.get().strip()):
+        if not is_valid_days(days_str):
             return messagebox.showerror("Quote error", "Number of days must be an integer between 1 and 60.")
-        if not is_valid_date(self.dep.get().strip()):
+        if not is_valid_date(dep_str):
             return messagebox.showerror("Quote error", "Departure date must be YYYY-MM-DD.")
         try:
-            arr_d = ISO(self.arr.get().strip()); dep_d = ISO(self.dep.get().strip())
+            arr_d = ISO(arr_str); dep_d = ISO(dep_str)
             if dep_d <= arr_d:
                 return messagebox.showerror("Quote error", "Departure must be after arrival.")
             span = (dep_d - arr_d).days
             self.nights_str.set(str(span))
-            if span != int(self.days.get().strip()):
-                messagebox.showwarning("Days mismatch", f"Nights from dates = {span}, but 'Number of Days' = {self.days.get().strip()}.")
+            if span != int(days_str):
+                messagebox.showwarning("Days mismatch", f"Nights from dates = {span}, but 'Number of Days' = {days_str}.")
             total, nightly, eligible, occ, _, _ = quote_total(self.state_data, self.arr.get(), self.dep.get(), self.rtype.get(), original_cost=0.0, is_change=False)
         except Exception as e:
             return messagebox.showerror("Quote error", str(e))
 
         self.lbl_quote.config(text=f"Total: ${total:,.2f} | Incentive eligible: {'Yes' if eligible else 'No'} | Occupancy: {occ*100:.1f}%")
-        for x in self.tree.get_children(): self.tree.delete(x)
-        for d, amt in nightly.items(): self.tree.insert("", "end", values=(d, f"${amt:,.2f}"))
+        # update the quote table in place
+        tree, rows = self.tree, self._quote_rows
+        for d in [d for d in rows if d not in nightly]:
+            tree.delete(d); del rows[d]
+        for d, amt in nightly.items():
+            vals = (d, f"${amt:,.2f}")
+            if d not in rows:
+                tree.insert("", "end", iid=d, values=vals)
+            elif rows[d] != vals:
+                tree.item(d, values=vals)
+            rows[d] = vals
+        tree.set_children("", *nightly)
         self.last_quote = (total, nightly, eligible, occ)
 
     def _validate_form(self):
@@ -532,26 +645,26 @@ class ReservationApp(tk.Tk):
             return "State is required."
         if not self.zipcode.get().strip():
             return "Zip code is required."
-        if not is_valid_date(self.arr.get().strip()):
+        arr, dep, days = self.arr.get().strip(), self.dep.get().strip(), self.days.get().strip()
+        if not is_valid_date(arr):
             return "Arrival date must be YYYY-MM-DD."
-        if self.dep.get().strip() and not is_valid_date(self.dep.get().strip()):
+        if dep and not is_valid_date(dep):
             return "Departure date must be YYYY-MM-DD."
-        if not is_valid_days(self.days.get().strip()):
+        if not is_valid_days(days):
             return "Number of days must be an integer between 1 and 60."
-        if not self.dep.get().strip():
+        if not dep:
             try:
-                arr_d = ISO(self.arr.get().strip())
-                dep_d = arr_d + dt.timedelta(days=int(self.days.get().strip()))
-                self.dep.set(dep_d.isoformat())
+                dep = (ISO(arr) + dt.timedelta(days=int(days))).isoformat()
+                self.dep.set(dep)
             except Exception:
                 return "Could not compute departure date from arrival + days."
         try:
-            arr_d = ISO(self.arr.get().strip()); dep_d = ISO(self.dep.get().strip())
+            arr_d = ISO(arr); dep_d = ISO(dep)
             if dep_d <= arr_d:
                 return "Departure must be after arrival."
             span = (dep_d - arr_d).days
-            if span != int(self.days.get().strip()):
-                messagebox.showwarning("Days mismatch", f"Nights from dates = {span}, but 'Number of Days' = {self.days.get().strip()}. Using dates for calculations.")
+            if span != int(days):
+                messagebox.showwarning("Days mismatch", f"Nights from dates = {span}, but 'Number of Days' = {days}. Using dates for calculations.")
                 self.days.set(str(span))
         except:
             return "Arrival or Departure date invalid."
@@ -571,15 +684,14 @@ class ReservationApp(tk.Tk):
             manual = self.manual_res_id.get().strip()
             if not manual:
                 return "Manual Reservation ID is empty. Enter an ID or enable auto assign."
-            for r in self.state_data["reservations"]:
-                existing_id = r.get("reservation_id", r.get("locator"))
-                if existing_id == manual:
-                    return f"Reservation ID {manual} already exists. Choose a different ID."
+            if manual in self._res_index:
+                return f"Reservation ID {manual} already exists. Choose a different ID."
         return None
 
     def on_save(self):
         if not self.last_quote:
             return messagebox.showwarning("Save", "Please get a quote first.")
+        self._check_disk()
         err = self._validate_form()
         if err:
             return messagebox.showerror("Validation error", err)
@@ -589,18 +701,18 @@ class ReservationApp(tk.Tk):
             res_id = next_locator(self.state_data)
         else:
             res_id = self.manual_res_id.get().strip()
-            m = re.match(r"^OO(\d+)$", res_id)
+            m = LOCATOR_RE.match(res_id)
             if m:
                 num = int(m.group(1))
                 if num > int(self.state_data.get("last_locator", 4000)):
                     self.state_data["last_locator"] = num
-                    save_state(self.state_data)
 
         rtype = self.rtype.get()
+        today = TODAY().isoformat()
         adv = total if rtype == "Prepaid" else 0.0
         n = self._calc_nights(self.arr.get(), self.dep.get())
 
-        self.state_data["reservations"].append({
+        rec = {
             "reservation_id": res_id,
             "locator": res_id,
             "guest_name": self.guest.get().strip(),
@@ -620,8 +732,8 @@ class ReservationApp(tk.Tk):
             "cc_type": self.cc_type.get().strip(),
             "cc_on_file": True,
             "paid_advance": round(adv, 2),
-            "paid_advance_date": TODAY().isoformat() if adv else "",
-            "payments": ([{"date": TODAY().isoformat(), "amount": round(adv,2)}] if adv else []),
+            "paid_advance_date": today if adv else "",
+            "payments": ([{"date": today, "amount": round(adv,2)}] if adv else []),
             "total_locked": round(total, 2),
             "snapshot": {"nightly": nightly},
             "assigned_room": self.assigned_room.get().strip(),
@@ -632,66 +744,153 @@ class ReservationApp(tk.Tk):
             "fully_paid": True if rtype == "Prepaid" else False,
             "no_show_penalty": 0.0,
             "change_note": "",
-            "created_date": TODAY().isoformat(),
+            "created_date": today,
             "created_by": self.authorized_user
-        })
-        save_state(self.state_data)
+        }
+        self.state_data["reservations"].append(rec)
+        self._res_index.setdefault(res_id, rec)
+        # new bookings are written immediately
+        if not self._flush_state():
+            return
         messagebox.showinfo("Saved", f"Reservation saved.\nReservation ID: {res_id}" + (f"\nAdvance paid: ${adv:,.2f}" if adv else ""))
-        self.refresh_res_list()
+        vals = self._row_values(rec)
+        self.res_tree.insert("", "end", iid=res_id, values=vals)
+        self._tree_rows[res_id] = vals
+        q, q_id = self._search_terms()
+        if not self._matches_search(rec, q, q_id):
+            self.res_tree.detach(res_id)
 
     # --------- Browser actions & reports ---------
-    def refresh_res_list(self):
-        self.res_tree.delete(*self.res_tree.get_children())
-        self.state_data = load_state()
+    def _search_terms(self):
         q = (self.search_var.get() or "").strip().lower()
         q_id = (self.search_res_id.get() or "").strip()
+        return q, q_id
+
+    def _matches_search(self, r, q, q_id):
+        if q:
+            # cached lowercase guest name
+            name = r.get("_guest_lower")
+            if name is None:
+                name = r["_guest_lower"] = r.get("guest_name","").lower()
+            if q not in name:
+                return False
+        if q_id and q_id not in str(r.get("reservation_id", r.get("locator",""))):
+            return False
+        return True
+
+    def _row_values(self, r):
+        try:
+            a, d = stay_span(r)
+            n = d - a
+        except (KeyError, TypeError, ValueError):
+            n = ""
+        rtype = r.get("rtype","")
+        # any advance payment counts as paid
+        paid_status = "Yes" if r.get("paid_advance", 0) > 0 or rtype in ("Conventional", "Incentive") else "No"
+        return (
+            r.get("reservation_id", r.get("locator","")),
+            r.get("guest_name",""),
+            r.get("arrive",""),
+            r.get("depart",""),
+            r.get("days", ""),
+            n,
+            r.get("room_type",""),
+            rtype,
+            r.get("status",""),
+            r.get("assigned_room",""),
+            paid_status,
+            mask_card(r.get("cc_info","")),
+            status_code(r)
+        )
+
+    def refresh_res_list(self):
+        if self._check_disk():
+            return
+        tree, rows = self.res_tree, self._tree_rows
+        q, q_id = self._search_terms()
+        filtered = bool(q or q_id)
+        matches, row_values = self._matches_search, self._row_values
+        visible = []
         for r in self.state_data["reservations"]:
-            guest_name = r.get("guest_name","").lower()
-            res_id = r.get("reservation_id", r.get("locator",""))
-            if q and q not in guest_name:
+            if filtered and not matches(r, q, q_id):
                 continue
-            if q_id and q_id not in str(res_id):
-                continue
-            try:
-                n = (ISO(r["depart"]) - ISO(r["arrive"])).days
-            except Exception:
-                n = ""
-            days = r.get("days", "")
-            paid_status = "Yes" if r.get("paid_advance", 0) > 0 or r.get("rtype") in ["Conventional", "Incentive"] else "No"
-            if r.get("rtype") == "60-Day" and r.get("paid_advance", 0) > 0:
-                paid_status = "Yes"
-            masked_card = mask_card(r.get("cc_info",""))
-            self.res_tree.insert("", "end", iid=res_id, values=(
-                res_id,
-                r.get("guest_name",""),
-                r.get("arrive",""),
-                r.get("depart",""),
-                days,
-                n,
-                r.get("room_type",""),
-                r.get("rtype",""),
-                r.get("status",""),
-                r.get("assigned_room",""),
-                paid_status,
-                masked_card,
-                status_code(r)
-            ))
+            vals = row_values(r)
+            iid = vals[0]  # the row's first column is its reservation id
+            if iid not in rows:
+                tree.insert("", "end", iid=iid, values=vals)
+            elif rows[iid] != vals:
+                tree.item(iid, values=vals)
+            rows[iid] = vals
+            visible.append(iid)
+        # re-link only the visible rows
+        tree.set_children("", *visible)
+
+    def _schedule_search(self, *_):
+        # Filter as the user types, but only once typing pauses
+        if self._search_job:
+            self.after_cancel(self._search_job)
+        self._search_job = self.after(150, self._run_search)
+
+    def _run_search(self):
+        self._search_job = None
+        self.refresh_res_list()
+
+    def _update_row(self, rec):
+        # redraw just this row
+        res_id = rec.get("reservation_id", rec.get("locator",""))
+        if res_id in self._tree_rows:
+            vals = self._row_values(rec)
+            self.res_tree.item(res_id, values=vals)
+            self._tree_rows[res_id] = vals
+        if rec is self.selected_reservation:
+            self.on_select_res()
+
+    def reload_from_disk(self):
+        if self._save_job and not self._flush_state():
+            return
+        self._load_from_disk()
+
+    def _load_from_disk(self):
+        if self._save_job:
+            self.after_cancel(self._save_job)
+            self._save_job = None
+        sel = self.res_tree.selection()
+        self.state_data = load_state()
+        self._file_mtime = file_mtime()
+        self._rebuild_index()
+        self.selected_reservation = None
+        self.res_tree.delete(*self._tree_rows)
+        self._tree_rows.clear()
+        self.refresh_res_list()
+        # reselect, or clear the panel
+        if sel and self.res_tree.exists(sel[0]):
+            self.res_tree.selection_set(sel[0])
+            self.on_select_res()
+        else:
+            self._clear_details()
+
+    def _clear_details(self):
+        self.d_lbl.config(text="Select a reservation to see details.")
+        self.d_status.set("Booked")
+        self.d_room.set("")
+        self.curr_arr_label.config(text="—")
+        self.curr_dep_label.config(text="—")
+        self.d_new_arr.set("")
+        self.d_new_dep.set("")
 
     def search_by_reservation_id(self):
         q_id = (self.search_res_id.get() or "").strip()
         if not q_id:
             return messagebox.showinfo("Search Reservation ID", "Enter a Reservation ID to search.")
-        for r in self.state_data.get("reservations", []):
-            res_id = r.get("reservation_id", r.get("locator",""))
-            if str(res_id) == q_id:
-                self.refresh_res_list()
-                try:
-                    self.res_tree.selection_set(res_id)
-                    self.res_tree.see(res_id)
-                    self.on_select_res()
-                except Exception:
-                    pass
-                return
+        if q_id in self._res_index:
+            self.refresh_res_list()
+            try:
+                self.res_tree.selection_set(q_id)
+                self.res_tree.see(q_id)
+                self.on_select_res()
+            except Exception:
+                pass
+            return
         self.refresh_res_list()
         messagebox.showinfo("Search Reservation ID", f"No exact match for '{q_id}'. Showing filtered list (partial matches).")
 
@@ -700,8 +899,7 @@ class ReservationApp(tk.Tk):
         if not sel:
             self.selected_reservation = None
             return
-        res_id = sel[0]
-        rec = next((x for x in self.state_data["reservations"] if x.get("reservation_id", x.get("locator"))==res_id), None)
+        rec = self._res_index.get(sel[0])
         if not rec:
             self.selected_reservation = None
             return
@@ -746,14 +944,14 @@ class ReservationApp(tk.Tk):
         if not sel:
             return messagebox.showwarning("Update", "Select a reservation in the table.")
         res_id = sel[0]
-        for r in self.state_data["reservations"]:
-            if r.get("reservation_id", r.get("locator"))==res_id:
-                r["status"] = self.d_status.get()
-                r["assigned_room"] = self.d_room.get().strip()
-                save_state(self.state_data)
-                self.refresh_res_list()
-                return messagebox.showinfo("Update", f"Reservation {res_id} updated.")
-        messagebox.showerror("Update", "Could not find reservation in data.")
+        r = self._res_index.get(res_id)
+        if r is None:
+            return messagebox.showerror("Update", "Could not find reservation in data.")
+        r["status"] = self.d_status.get()
+        r["assigned_room"] = self.d_room.get().strip()
+        self._schedule_save()
+        self._update_row(r)
+        messagebox.showinfo("Update", f"Reservation {res_id} updated.")
 
     # --------- Date change ---------
     def quote_date_change(self):
@@ -764,19 +962,19 @@ class ReservationApp(tk.Tk):
         new_depart = self.d_new_dep.get().strip()
         if not is_valid_date(new_arrive) or not is_valid_date(new_depart):
             return messagebox.showerror("Date Change", "New arrival/departure must be YYYY-MM-DD.")
-        if ISO(new_depart) <= ISO(new_arrive):
+        start, end = ISO(new_arrive), ISO(new_depart)
+        if end <= start:
             return messagebox.showerror("Date Change", "Departure must be after arrival.")
 
         try:
             original_cost = rec.get("total_locked", 0.0)
             is_change = rec["rtype"] in ["Prepaid", "60-Day"]
-            start = ISO(new_arrive); end = ISO(new_depart)
             available, min_avail = is_available_for(self.state_data, start, end, exclude_reservation_id=rec.get("reservation_id", rec.get("locator")))
             total, nightly, eligible, occ, change_note, penalty_amount = quote_total(
                 self.state_data, new_arrive, new_depart, rec["rtype"],
                 original_cost, is_change=is_change
             )
-            nights = (ISO(new_depart) - ISO(new_arrive)).days
+            nights = (end - start).days
             difference = total - original_cost
             message = (
                 f"Date Change Quote for {rec.get('reservation_id', rec.get('locator'))}:\n\n"
@@ -806,13 +1004,13 @@ class ReservationApp(tk.Tk):
         new_depart = self.d_new_dep.get().strip()
         if not is_valid_date(new_arrive) or not is_valid_date(new_depart):
             return messagebox.showerror("Date Change", "New arrival/departure must be YYYY-MM-DD.")
-        if ISO(new_depart) <= ISO(new_arrive):
+        start, end = ISO(new_arrive), ISO(new_depart)
+        if end <= start:
             return messagebox.showerror("Date Change", "Departure must be after arrival.")
 
         try:
             original_cost = rec.get("total_locked", 0.0)
             is_change = rec["rtype"] in ["Prepaid", "60-Day"]
-            start = ISO(new_arrive); end = ISO(new_depart)
             available, min_avail = is_available_for(self.state_data, start, end, exclude_reservation_id=rec.get("reservation_id", rec.get("locator")))
             if not available:
                 return messagebox.showerror("Apply Date Change", f"Requested dates are not available. Minimum rooms available on span: {min_avail}.")
@@ -829,7 +1027,7 @@ class ReservationApp(tk.Tk):
             if rec["status"] == "Changing date":
                 rec["status"] = "Booked"
                 self.d_status.set("Booked")
-            save_state(self.state_data)
+            self._schedule_save()
             self.curr_arr_label.config(text=new_arrive)
             self.curr_dep_label.config(text=new_depart)
             msg = (
@@ -844,7 +1042,7 @@ class ReservationApp(tk.Tk):
             if penalty_amount:
                 msg += f"\n\nPenalty/extra charge due to change: ${penalty_amount:,.2f}"
             messagebox.showinfo("Date Change Applied", msg)
-            self.refresh_res_list()
+            self._update_row(rec)
         except Exception as e:
             messagebox.showerror("Apply Date Change Error", str(e))
 
@@ -860,13 +1058,14 @@ class ReservationApp(tk.Tk):
             return messagebox.showinfo("Payment", f"{rec['rtype']} reservations are paid at checkout, not in advance.")
         amount = rec["total_locked"] - rec.get("paid_advance", 0)
         if messagebox.askyesno("Process Prepayment", f"Process prepayment of ${amount:,.2f} for reservation {res_id}?\nGuest: {rec['guest_name']}"):
+            today = TODAY().isoformat()
             payments = rec.setdefault("payments", [])
-            payments.append({"date": TODAY().isoformat(), "amount": round(amount,2)})
+            payments.append({"date": today, "amount": round(amount,2)})
             rec["paid_advance"] = rec["total_locked"]
-            rec["paid_advance_date"] = TODAY().isoformat()
+            rec["paid_advance_date"] = today
             rec["fully_paid"] = True
-            save_state(self.state_data)
-            self.refresh_res_list()
+            self._schedule_save()
+            self._update_row(rec)
             messagebox.showinfo("Payment Processed", f"Prepayment of ${amount:,.2f} processed for {res_id}")
 
     def process_payment(self):
@@ -881,17 +1080,18 @@ class ReservationApp(tk.Tk):
         amount_due = rec["total_locked"] - rec.get("paid_advance", 0)
         if amount_due <= 0:
             rec["fully_paid"] = True
-            save_state(self.state_data)
-            self.refresh_res_list()
+            self._schedule_save()
+            self._update_row(rec)
             return messagebox.showinfo("Payment", f"No amount due. Marked {res_id} as fully paid.")
         if messagebox.askyesno("Process Payment", f"Process payment of ${amount_due:,.2f} for reservation {res_id}?\nGuest: {rec['guest_name']}"):
+            today = TODAY().isoformat()
             payments = rec.setdefault("payments", [])
-            payments.append({"date": TODAY().isoformat(), "amount": round(amount_due,2)})
+            payments.append({"date": today, "amount": round(amount_due,2)})
             rec["paid_advance"] = rec["total_locked"]
-            rec["paid_advance_date"] = TODAY().isoformat()
+            rec["paid_advance_date"] = today
             rec["fully_paid"] = True
-            save_state(self.state_data)
-            self.refresh_res_list()
+            self._schedule_save()
+            self._update_row(rec)
             messagebox.showinfo("Payment Processed", f"Payment of ${amount_due:,.2f} processed for {res_id}")
 
     def cancel_reservation(self):
@@ -905,12 +1105,14 @@ class ReservationApp(tk.Tk):
         if rec.get("checked_out"):
             return messagebox.showwarning("Cancellation", "Cannot cancel checked-out reservation.")
 
+        # one date for preview and charge
+        today = TODAY()
         if rtype in ["Prepaid", "60-Day"]:
             policy = "NO REFUND for cancellations"
         else:
-            days_until_arrival = (ISO(rec["arrive"]) - TODAY()).days
+            days_until_arrival = (ISO(rec["arrive"]) - today).days
             if days_until_arrival < 3:
-                penalty_preview = list(rec.get('snapshot', {}).get('nightly', {}).values())[0] if rec.get('snapshot', {}).get('nightly') else base_rate(self.state_data, ISO(rec["arrive"]))
+                penalty_preview = first_night_rate(self.state_data, rec)
                 policy = f"Charge first night (${penalty_preview:.2f}) as penalty"
             else:
                 policy = "No penalty"
@@ -920,15 +1122,15 @@ class ReservationApp(tk.Tk):
             if rtype in ["Prepaid", "60-Day"]:
                 pass
             elif rtype in ["Conventional", "Incentive"]:
-                days_until_arrival = (ISO(rec["arrive"]) - TODAY()).days
+                days_until_arrival = (ISO(rec["arrive"]) - today).days
                 if days_until_arrival < 3:
-                    penalty = list(rec.get('snapshot', {}).get('nightly', {}).values())[0] if rec.get('snapshot', {}).get('nightly') else base_rate(self.state_data, ISO(rec["arrive"]))
+                    penalty = first_night_rate(self.state_data, rec)
                     rec["no_show_penalty"] = penalty
                     rec["paid_advance"] = max(rec.get("paid_advance", 0.0), penalty)
             rec["status"] = "Cancelled"
-            rec["cancelled_date"] = TODAY().isoformat()
-            save_state(self.state_data)
-            self.refresh_res_list()
+            rec["cancelled_date"] = today.isoformat()
+            self._schedule_save()
+            self._update_row(rec)
             messagebox.showinfo("Cancelled", f"Reservation {res_id} cancelled.\nPolicy applied: {policy}")
 
     def check_in_guest(self):
@@ -945,8 +1147,8 @@ class ReservationApp(tk.Tk):
         rec["status"] = "In-House"
         rec["checked_in"] = True
         rec["check_in_date"] = TODAY().isoformat()
-        save_state(self.state_data)
-        self.refresh_res_list()
+        self._schedule_save()
+        self._update_row(rec)
         messagebox.showinfo("Checked In", f"Guest {rec['guest_name']} checked into room {rec['assigned_room']}")
 
     def check_out_guest(self):
@@ -963,17 +1165,18 @@ class ReservationApp(tk.Tk):
         if final_payment > 0:
             msg += f"\n\nFinal payment due: ${final_payment:,.2f}"
         if messagebox.askyesno("Check Out", msg):
+            today = TODAY().isoformat()
             if final_payment > 0:
                 payments = rec.setdefault("payments", [])
-                payments.append({"date": TODAY().isoformat(), "amount": round(final_payment,2)})
+                payments.append({"date": today, "amount": round(final_payment,2)})
                 rec["paid_advance"] = rec["total_locked"]
-                rec["paid_advance_date"] = TODAY().isoformat()
+                rec["paid_advance_date"] = today
                 rec["fully_paid"] = True
             rec["status"] = "Checked-out"
             rec["checked_out"] = True
-            rec["check_out_date"] = TODAY().isoformat()
-            save_state(self.state_data)
-            self.refresh_res_list()
+            rec["check_out_date"] = today
+            self._schedule_save()
+            self._update_row(rec)
             messagebox.showinfo("Checked Out", f"Guest {rec['guest_name']} checked out." +
                                 (f"\nFinal payment of ${final_payment:,.2f} processed." if final_payment > 0 else ""))
 
@@ -997,8 +1200,7 @@ class ReservationApp(tk.Tk):
         notes.append(f"Stay: {arrive} → {depart} ({nights} nights)")
         if nightly_rates:
             notes.append("Nightly rates (locked):")
-            for d, amt in nightly_rates.items():
-                notes.append(f"  {d}: ${amt:,.2f}")
+            notes.extend(f"  {d}: ${amt:,.2f}" for d, amt in nightly_rates.items())
         else:
             notes.append("Nightly rates: not available")
         notes.append(f"Subtotal (total locked): ${total_locked:,.2f}")
@@ -1008,8 +1210,7 @@ class ReservationApp(tk.Tk):
             notes.append(f"Cancellation penalty: ${penalty:,.2f}")
         if payments:
             notes.append("Payments:")
-            for p in payments:
-                notes.append(f"  {p.get('date','')}  ${p.get('amount',0):,.2f}")
+            notes.extend(f"  {p.get('date','')}  ${p.get('amount',0):,.2f}" for p in payments)
         elif paid:
             notes.append(f"Advance/previous payments: ${paid:,.2f} (date: {rec.get('paid_advance_date','')})")
         balance = max(0.0, total_locked - paid) + (penalty or 0.0)
@@ -1017,10 +1218,11 @@ class ReservationApp(tk.Tk):
         messagebox.showinfo("Generated Bill", "\n".join(notes))
 
     def verify_availability(self):
-        if not is_valid_date(self.arr.get().strip()) or not is_valid_days(self.days.get().strip()):
+        arr, days = self.arr.get().strip(), self.days.get().strip()
+        if not is_valid_date(arr) or not is_valid_days(days):
             return messagebox.showerror("Availability", "Enter valid Arrival (YYYY-MM-DD) and Number of Days.")
-        start = ISO(self.arr.get().strip())
-        end = start + dt.timedelta(days=int(self.days.get().strip()))
+        start = ISO(arr)
+        end = start + dt.timedelta(days=int(days))
         available, min_avail = is_available_for(self.state_data, start, end)
         occ = occ_ratio(self.state_data, start, end)
         avg_occupied = round(occ * ROOM_COUNT, 1)
@@ -1030,6 +1232,7 @@ class ReservationApp(tk.Tk):
     def run_daily_tasks_ui(self):
         tasks = run_daily_tasks(self.state_data)
         if tasks:
+            self._schedule_save()
             messagebox.showinfo("Daily Tasks Completed", "The following tasks were performed:\n\n• " + "\n• ".join(tasks))
         else:
             messagebox.showinfo("Daily Tasks", "No daily tasks needed to be performed.")
@@ -1060,7 +1263,7 @@ class ReservationApp(tk.Tk):
             if d in self.state_data["base_rates"]:
                 return log("Rate already exists for this date.")
             self.state_data["base_rates"][d] = r
-            save_state(self.state_data)
+            self._schedule_save()
             log(f"Added base rate {d} -> {r:.2f}")
 
         def update_rate():
@@ -1075,7 +1278,7 @@ class ReservationApp(tk.Tk):
             if d not in self.state_data["base_rates"]:
                 return log("Error: Rate does not exist; cannot update.")
             self.state_data["base_rates"][d] = r
-            save_state(self.state_data)
+            self._schedule_save()
             log(f"Updated base rate {d} -> {r:.2f}")
 
         def delete_rate():
@@ -1085,7 +1288,7 @@ class ReservationApp(tk.Tk):
             if d not in self.state_data["base_rates"]:
                 return log("Error: Rate does not exist; nothing to delete.")
             del self.state_data["base_rates"][d]
-            save_state(self.state_data)
+            self._schedule_save()
             log(f"Deleted base rate {d}")
 
         tk.Button(win, text="Add", command=add_rate).grid(row=0, column=2, padx=8)
@@ -1110,14 +1313,12 @@ class ReservationApp(tk.Tk):
             nightly_rates = rec.get("snapshot", {}).get("nightly", {})
             lines = [f"Accommodation Bill — {res_id} — Guest: {rec.get('guest_name','')}",
                      f"Stay: {arrive} → {depart} ({nights} nights)"]
-            for d, amt in nightly_rates.items():
-                lines.append(f"  {d}: ${amt:,.2f}")
+            lines.extend(f"  {d}: ${amt:,.2f}" for d, amt in nightly_rates.items())
             lines.append(f"Total: ${rec.get('total_locked',0.0):,.2f}")
             payments = rec.get("payments", [])
             if payments:
                 lines.append("Payments:")
-                for p in payments:
-                    lines.append(f"  {p.get('date','')}  ${p.get('amount',0):,.2f}")
+                lines.extend(f"  {p.get('date','')}  ${p.get('amount',0):,.2f}" for p in payments)
             with open(fname, "w") as f: f.write("\n".join(lines))
             messagebox.showinfo("Report", f"Printed {fname}")
 
@@ -1134,8 +1335,9 @@ class ReservationApp(tk.Tk):
         def daily_occupancy_report():
             today = TODAY()
             fname = f"occupancy_{today.isoformat()}.txt"
-            occupied = sum(ISO(r["arrive"]) <= today < ISO(r["depart"]) and r.get("status") in ("Booked","In-House")
-                           for r in self.state_data["reservations"])
+            t = today.toordinal()
+            spans = [stay_span(r) for r in self.state_data["reservations"] if r.get("status") in ("Booked","In-House")]
+            occupied = sum(a <= t < b for a, b in spans)
             occ_pct = (occupied/ROOM_COUNT)*100 if ROOM_COUNT else 0
             with open(fname, "w") as f:
                 f.write(f"Occupied rooms: {occupied}/{ROOM_COUNT}\nOccupancy: {occ_pct:.1f}%\n")
@@ -1145,10 +1347,9 @@ class ReservationApp(tk.Tk):
             start = TODAY(); horizon = 7
             fname = f"expected_occupancy_{start.isoformat()}.txt"
             lines = []
-            for i in range(horizon):
+            spans = [stay_span(r) for r in self.state_data["reservations"] if r.get("status") in ("Booked","In-House")]
+            for i, occ in enumerate(nightly_counts(spans, start, start + dt.timedelta(days=horizon))):
                 d = start + dt.timedelta(days=i)
-                occ = sum(ISO(r["arrive"]) <= d < ISO(r["depart"]) and r.get("status") in ("Booked","In-House")
-                          for r in self.state_data["reservations"])
                 lines.append(f"{d.isoformat()}: {occ}/{ROOM_COUNT}")
             with open(fname, "w") as f: f.write("\n".join(lines))
             messagebox.showinfo("Report", f"Printed {fname}")
@@ -1157,14 +1358,17 @@ class ReservationApp(tk.Tk):
             start = TODAY(); horizon = 7
             fname = f"expected_income_{start.isoformat()}.txt"
             lines = []
-            for i in range(horizon):
-                d = start + dt.timedelta(days=i)
-                total = 0.0
-                for r in self.state_data["reservations"]:
-                    if ISO(r["arrive"]) <= d < ISO(r["depart"]) and r.get("status") in ("Booked","In-House"):
-                        base = base_rate(self.state_data, d)
-                        mult = RATE_MULT.get(r.get("rtype","Conventional"), 1.0)
-                        total += base * mult
+            active = [(stay_span(r), RATE_MULT.get(r.get("rtype","Conventional"), 1.0))
+                      for r in self.state_data["reservations"] if r.get("status") in ("Booked","In-House")]
+            days = [start + dt.timedelta(days=i) for i in range(horizon)]
+            bases = [base_rate(self.state_data, d) for d in days]
+            totals = [0.0] * horizon
+            # add each stay to the nights it covers
+            s = start.toordinal()
+            for (a, b), mult in active:
+                for i in range(max(a - s, 0), min(b - s, horizon)):
+                    totals[i] += bases[i] * mult
+            for d, total in zip(days, totals):
                 lines.append(f"{d.isoformat()}: ${total:,.2f}")
             with open(fname, "w") as f: f.write("\n".join(lines))
             messagebox.showinfo("Report", f"Printed {fname}")
@@ -1182,10 +1386,17 @@ class ReservationApp(tk.Tk):
 
         def admin_assessment():
             tasks = run_daily_tasks(self.state_data)
+            if tasks:
+                self._schedule_save()
             fname = f"admin_assessment_{TODAY().isoformat()}.txt"
             with open(fname, "w") as f: f.write("\n".join(tasks) if tasks else "No tasks performed.")
             messagebox.showinfo("Admin Assessment", f"Printed {fname}")
 
+        def export_readable_data():
+            fname = f"hrs_data_{TODAY().isoformat()}.json"
+            save_state(self.state_data, fname, pretty=True)
+            messagebox.showinfo("Export", f"Saved {fname}")
+
         tk.Button(btns, text="Print Bill Accommodation", command=print_bill_accommodation).grid(row=0, column=0, padx=6, pady=6, sticky="w")
         tk.Button(btns, text="Daily Arrivals Report", command=daily_arrivals_report).grid(row=0, column=1, padx=6, pady=6, sticky="w")
         tk.Button(btns, text="Daily Occupancy Report", command=daily_occupancy_report).grid(row=0, column=2, padx=6, pady=6, sticky="w")
@@ -1193,11 +1404,17 @@ class ReservationApp(tk.Tk):
         tk.Button(btns, text="Expected Room Income", command=expected_room_income_report).grid(row=1, column=1, padx=6, pady=6, sticky="w")
         tk.Button(btns, text="Incentive Report", command=incentive_report).grid(row=1, column=2, padx=6, pady=6, sticky="w")
         tk.Button(btns, text="Admin Assessment (No-shows & 60-day reminders)", command=admin_assessment).grid(row=2, column=0, columnspan=3, padx=6, pady=8, sticky="w")
+        tk.Button(btns, text="Export Readable Data", command=export_readable_data).grid(row=3, column=0, padx=6, pady=6, sticky="w")
 
 # --------- Entry point ---------
 if __name__ == "__main__":
     login = LoginWindow()
     login.mainloop()
+    # Build the main app only after the login interpreter has fully exited
+    if login.authorized_user:
+        app = ReservationApp(authorized_user=login.authorized_user)
+        app.geometry("1100x820")
+        app.mainloop()
 
 
 
@@ -1,11 +1,17 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-from datetime import datetime
+from datetime import datetime, date
 import json, os
 # the data file is "hrs_data"
 DATA_FILE = "hrs_data.json"
+# parsed data file, keyed on its mtime
+_data_cache = {"mtime": None, "reservations": [], "by_locator": {}, "locators": []}
+# locator -> (record, Bill) for the bill last built from that record
+_bill_cache = {}
 
 # ---------------- Bill Model ----------------
+BILL_RULE = "-" * 25
+
 class Bill:
     def __init__(self, billId, guestName, roomNum, arrival, departure, nights, resType, totalAmt, paidAmt, balance):
         self.billId = billId
@@ -19,11 +25,15 @@ class Bill:
         self.billDateDeparture = departure or ""
         self.billNightsStayedNum = str(nights or "")
         self.billResType = resType or ""
+        self._text = None
 
     def generateBill(self):
+        # formatted once
+        if self._text is not None:
+            return self._text
         lines = [
             "Ophelia's Oasis Hotel",
-            "-------------------------",
+            BILL_RULE,
             f"Bill ID: {self.billId}",
             f"Bill Issue Date: {self.billIssueDate}",
             f"Guest Name: {self.billGuestName}",
@@ -35,36 +45,47 @@ class Bill:
             f"Total Amount: ${self.billTotalAmt:.2f}",
             f"Paid: ${self.billPaidAmt:.2f}",
             f"Balance: ${self.billBalanceAmt:.2f}",
-            "-------------------------",
+            BILL_RULE,
         ]
-        return "\n".join(lines)
+        self._text = "\n".join(lines)
+        return self._text
 
 # ---------------- Data Helpers ----------------
 def load_data():
-    if not os.path.exists(DATA_FILE):
+    try:
+        mtime = os.stat(DATA_FILE).st_mtime_ns
+    except OSError:
+        _data_cache.update(mtime=None, reservations=[], by_locator={}, locators=[])
         return []
-    with open(DATA_FILE, "r") as f:
-        try:
-            data = json.load(f)
-            return data.get("reservations", [])
-        except Exception:
-            return []
+    if mtime != _data_cache["mtime"]:
+        with open(DATA_FILE, "r") as f:
+            try:
+                reservations = json.load(f).get("reservations", [])
+            except Exception:
+                reservations = []
+        _data_cache["mtime"] = mtime
+        _data_cache["reservations"] = reservations
+        by_locator = {}
+        for r in reservations:
+            r["_nights"] = compute_nights(r.get("arrive", ""), r.get("depart", ""))
+            # first match wins
+            if r.get("locator"):
+                by_locator.setdefault(r["locator"], r)
+        _data_cache["by_locator"] = by_locator
+        _data_cache["locators"] = sorted(by_locator)
+    return _data_cache["reservations"]
 
 def find_reservation_by_locator(locator):
     locator = (locator or "").strip()
     if not locator:
         return None
-    for r in load_data():
-        if r.get("locator") == locator:
-            return r
-    return None
+    load_data()
+    return _data_cache["by_locator"].get(locator)
 
 def compute_nights(arrive, depart):
     try:
-        a = datetime.strptime(arrive, "%Y-%m-%d")
-        d = datetime.strptime(depart, "%Y-%m-%d")
-        return (d - a).days
-    except Exception:
+        return (date.fromisoformat(depart) - date.fromisoformat(arrive)).days
+    except (TypeError, ValueError):
         return ""
 
 def compute_totals(rec):
@@ -74,6 +95,29 @@ def compute_totals(rec):
     balance = max(0.0, total - paid) + penalty
     return total, paid, balance
 
+def get_bill(locator, rec):
+    # cached per record and issue date
+    today = datetime.now().strftime("%Y-%m-%d")
+    cached = _bill_cache.get(locator)
+    if cached and cached[0] is rec and cached[1].billIssueDate == today:
+        return cached[1]
+    total, paid, balance = compute_totals(rec)
+    nights = rec["_nights"]
+    bill = Bill(
+        billId=locator,
+        guestName=rec.get("guest_name", ""),
+        roomNum=rec.get("assigned_room", ""),
+        arrival=rec.get("arrive", ""),
+        departure=rec.get("depart", ""),
+        nights=nights,
+        resType=rec.get("rtype", ""),
+        totalAmt=total,
+        paidAmt=paid,
+        balance=balance
+    )
+    _bill_cache[locator] = (rec, bill)
+    return bill
+
 # ---------------- UI Helpers ----------------
 def set_entry(entry_widget, value):
     entry_widget.config(state="normal")
@@ -95,9 +139,8 @@ def clear_form():
     status_lbl["text"] = "-"
 
 def populate_locator_dropdown():
-    reservations = load_data()
-    locs = [r.get("locator", "") for r in reservations if r.get("locator")]
-    locator_combo["values"] = sorted(locs)
+    load_data()
+    locator_combo["values"] = _data_cache["locators"]
 
 # ---------------- Actions ----------------
 def load_reservation_action():
@@ -110,17 +153,12 @@ def load_reservation_action():
 
     # basic fields
     set_entry(ent_res_id, locator)
-    set_entry(ent_guest, rec.get("guest_name", ""))
-    set_entry(ent_room, rec.get("assigned_room", ""))
-    set_entry(ent_mobile, rec.get("phone", ""))
+    for entry, key in record_entries:
+        set_entry(entry, rec.get(key, ""))
 
     set_entry(ent_issue_date, datetime.now().strftime("%Y-%m-%d"))
-    set_entry(ent_arrival, rec.get("arrive", ""))
-    set_entry(ent_departure, rec.get("depart", ""))
-
-    nights = compute_nights(rec.get("arrive", ""), rec.get("depart", ""))
+    nights = rec["_nights"]
     set_entry(ent_nights, str(nights))
-    set_entry(ent_res_type, rec.get("rtype", ""))
 
     total, paid, balance = compute_totals(rec)
     total_lbl["text"] = f"${total:.2f}"
@@ -135,21 +173,7 @@ def preview_bill_action():
     if not rec:
         return messagebox.showerror("Error", "No reservation loaded.")
 
-    total, paid, balance = compute_totals(rec)
-    nights = compute_nights(rec.get("arrive", ""), rec.get("depart", ""))
-
-    bill = Bill(
-        billId=locator,
-        guestName=rec.get("guest_name", ""),
-        roomNum=rec.get("assigned_room", ""),
-        arrival=rec.get("arrive", ""),
-        departure=rec.get("depart", ""),
-        nights=nights,
-        resType=rec.get("rtype", ""),
-        totalAmt=total,
-        paidAmt=paid,
-        balance=balance
-    )
+    bill = get_bill(locator, rec)
 
     top = tk.Toplevel(root)
     top.title(f"Bill Preview — {locator}")
@@ -179,22 +203,8 @@ def process_checkout_action():
         return messagebox.showerror("Error", "No reservation loaded.")
 
     # Business rules: if Conventional/Incentive with unpaid balance, allow checkout and compute final balance
-    total, paid, balance = compute_totals(rec)
-    nights = compute_nights(rec.get("arrive", ""), rec.get("depart", ""))
-
     # Generate and save bill regardless of status; staff can use this as final receipt
-    bill = Bill(
-        billId=locator,
-        guestName=rec.get("guest_name", ""),
-        roomNum=rec.get("assigned_room", ""),
-        arrival=rec.get("arrive", ""),
-        departure=rec.get("depart", ""),
-        nights=nights,
-        resType=rec.get("rtype", ""),
-        totalAmt=total,
-        paidAmt=paid,
-        balance=balance
-    )
+    bill = get_bill(locator, rec)
     fname = f"receipt_{locator}.txt"
     with open(fname, "w") as f:
         f.write(bill.generateBill())
@@ -240,6 +250,12 @@ ent_departure  = make_entry("Departure Date:")
 ent_nights     = make_entry("Nights Stayed:")
 ent_res_type   = make_entry("Reservation Type:")
 
+# Entries filled straight from a reservation field on Load
+record_entries = (
+    (ent_guest, "guest_name"), (ent_room, "assigned_room"), (ent_mobile, "phone"),
+    (ent_arrival, "arrive"), (ent_departure, "depart"), (ent_res_type, "rtype"),
+)
+
 # Status row
 status_row = tk.Frame(root); status_row.pack(anchor="w", padx=10, pady=(8,2), fill="x")
 tk.Label(status_row, text="Reservation Status:", width=18, anchor="w").pack(side="left")
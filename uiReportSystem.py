@@ -31,6 +31,7 @@ MONTHS = [
     ("05", "May"), ("06", "June"), ("07", "July"), ("08", "August"),
     ("09", "September"), ("10", "October"), ("11", "November"), ("12", "December")
 ]
+MONTH_CODES = tuple(code for code, name in MONTHS)
 
 def current_year_str():
     return str(date.today().year)
@@ -106,7 +107,7 @@ range_type_cb.grid(row=1, column=1, sticky="ew", padx=8, pady=4)
 ttk.Label(report_frame, text="Month").grid(row=1, column=2, sticky="w", padx=8, pady=4)
 month_var = tk.StringVar(value=current_month_str())
 month_cb = ttk.Combobox(report_frame, textvariable=month_var,
-                        values=[code for code, name in MONTHS], width=6, state="readonly")
+                        values=MONTH_CODES, width=6, state="readonly")
 month_cb.grid(row=1, column=3, sticky="w", padx=8, pady=4)
 
 ttk.Label(report_frame, text="Year").grid(row=2, column=2, sticky="w", padx=8, pady=4)
@@ -241,8 +242,7 @@ def collect_status_filter():
 
 def generate_report():
     # Clear preview
-    for item in preview_tv.get_children():
-        preview_tv.delete(item)
+    preview_tv.delete(*preview_tv.get_children())
 
     start_str, end_str = normalize_date_range()
     status_active = collect_status_filter()
@@ -283,8 +283,7 @@ def generate_report():
         print("[Preview] Parameters:", params)
 
 def clear_preview():
-    for item in preview_tv.get_children():
-        preview_tv.delete(item)
+    preview_tv.delete(*preview_tv.get_children())
 
 preview_btn = ttk.Button(buttons_frame, text="Preview / Generate", command=generate_report)
 preview_btn.grid(row=0, column=1, sticky="e", padx=6)